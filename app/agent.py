@@ -1,23 +1,55 @@
 # app/agent.py
 import os
-import json
+import sys
 import time
-import requests
+import atexit
+import base64
+import queue
+import threading
+import asyncio
+import httpx
+import orjson
+import numpy as np
+import torch
 from chromadb import PersistentClient
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
 import hashlib
+from collections import deque
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
 DB_DIR = "./chroma_db1"
 STATIC_COLLECTION = "devops_mini"           # Static docs
-MEMORY_COLLECTION = "memory_devops_mini"    # Dynamic long-term memory
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"        # Must match build_index.py (384-dim)
+# Versioned by embedder: the old unversioned collection holds 768-dim mpnet
+# vectors that MiniLM queries can neither match nor upsert into
+MEMORY_COLLECTION = f"memory_devops_mini_{EMBEDDING_MODEL}"
+CACHE_COLLECTION = "prompt_cache"           # Semantic prompt -> response cache
 OLLAMA_API = "http://localhost:11434/api/generate"
 MODEL_NAME = "llama3"
 MAX_CONTEXT_DOCS = 5
+MMR_POOL_SIZE = 20   # candidates fetched before MMR re-ranking
+MMR_LAMBDA = 0.7     # relevance vs diversity trade-off
 MEMORY_SIZE = 3  # short-term buffer
+CACHE_SIM_THRESHOLD = 0.87  # min cosine similarity for a cache hit
+CACHE_MAX_ENTRIES = 500     # evict oldest entries beyond this
+MEMORY_FLUSH_SIZE = 32      # batch pending memory writes before upserting
+EMBED_BUCKETS = (16, 32, 64, 128, 256, 512)  # token-length buckets for batched embeds
+RECENT_PROMPTS = 16         # ring buffer for the repeat-query short circuit
+RECENT_SIM_THRESHOLD = 0.9  # similarity above which a query counts as a repeat
+CONTEXT_CACHE_SIZE = 256    # memoized build_context entries
+
+# Let the Ollama server handle concurrent requests (picked up if the
+# server is launched from this environment).
+os.environ.setdefault("OLLAMA_NUM_PARALLEL", "4")
 
 # -----------------------------
 # INITIALIZE
@@ -31,55 +63,196 @@ try:
     print(f"[+] Static collection '{STATIC_COLLECTION}' loaded.")
 except Exception:
     raise RuntimeError(f"[!] Could not load static collection '{STATIC_COLLECTION}'")
+if (static_collection.metadata or {}).get("hnsw:space") != "cosine":
+    print(
+        f"[!] Static collection '{STATIC_COLLECTION}' predates cosine space — "
+        "re-run build_index.py to rebuild it."
+    )
 
 # Persistent Memory
 try:
     memory_collection = client.get_collection(MEMORY_COLLECTION)
+    if (memory_collection.metadata or {}).get("hnsw:space") != "cosine":
+        # Stored under L2 with unnormalized vectors — recreate in cosine space
+        print(f"[!] Memory collection '{MEMORY_COLLECTION}' predates cosine space — recreating...")
+        client.delete_collection(MEMORY_COLLECTION)
+        raise LookupError(MEMORY_COLLECTION)
     print(f"[+] Memory collection '{MEMORY_COLLECTION}' loaded.")
 except Exception:
-    memory_collection = client.create_collection(MEMORY_COLLECTION)
+    memory_collection = client.create_collection(
+        MEMORY_COLLECTION, metadata={"hnsw:space": "cosine"}
+    )
     print(f"[+] Memory collection '{MEMORY_COLLECTION}' created.")
 
-embedder = SentenceTransformer("all-mpnet-base-v2")
+# Semantic Prompt Cache
+try:
+    prompt_cache = client.get_collection(CACHE_COLLECTION)
+    print(f"[+] Prompt cache '{CACHE_COLLECTION}' loaded.")
+except Exception:
+    prompt_cache = client.create_collection(
+        CACHE_COLLECTION, metadata={"hnsw:space": "cosine"}
+    )
+    print(f"[+] Prompt cache '{CACHE_COLLECTION}' created.")
+
+# Embedder on GPU fp16 when available — halves bandwidth and doubles matmul
+# throughput vs CPU fp32
+EMBED_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+embedder = SentenceTransformer(EMBEDDING_MODEL, device=EMBED_DEVICE)
+if EMBED_DEVICE == "cuda":
+    embedder.half()
+print(f"[+] Embedder ready on {EMBED_DEVICE}.")
+
+# One shared async HTTP client — connections to Ollama are reused across turns
+ollama_client = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(120.0),
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+)
 
 print("[+] DevOps AI Agent ready. Type 'exit' to quit.\n")
 
-conversation_history = []
+# Short-term history as parallel deques: bounded, O(1) eviction, and the
+# queries side can be handed to embedder.encode as-is
+recent_queries = deque(maxlen=MEMORY_SIZE)
+recent_answers = deque(maxlen=MEMORY_SIZE)
 
 # -----------------------------
 # HELPERS
 # -----------------------------
 def hash_text(text: str) -> str:
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+# Embeddings are unit vectors, so one global scale covers every dimension
+Q8_SCALE = 1.0 / 127.0
+
+def quantize_embedding(vec):
+    """Int8-quantize a normalized embedding (4x smaller than fp32)."""
+    return np.clip(np.round(vec * 127), -128, 127).astype(np.int8)
+
+def dequantize_embedding(blob_b64):
+    """Recover an approximate fp32 embedding from base64-encoded int8 bytes."""
+    q = np.frombuffer(base64.b64decode(blob_b64), dtype=np.int8)
+    return q.astype(np.float32) * Q8_SCALE
 
 # -----------------------------
 # MEMORY HANDLING
 # -----------------------------
+_pending_memory = []  # buffered (id, document, metadata) writes
+
+def _length_bucket(n_tokens):
+    for cap in EMBED_BUCKETS:
+        if n_tokens <= cap:
+            return cap
+    return EMBED_BUCKETS[-1]
+
+def _embed_bucketed(documents):
+    """Embed texts grouped by token-length bucket so short texts never pad
+    to the length of the longest buffered text."""
+    token_lens = [
+        len(token_ids) for token_ids in embedder.tokenizer(
+            list(documents), truncation=True, max_length=EMBED_BUCKETS[-1]
+        )["input_ids"]
+    ]
+    buckets = {}
+    for idx, n_tokens in enumerate(token_lens):
+        buckets.setdefault(_length_bucket(n_tokens), []).append(idx)
+
+    embeddings = [None] * len(documents)
+    for cap in sorted(buckets):
+        # Sort within the bucket too, keeping longest-padding tight
+        idxs = sorted(buckets[cap], key=lambda i: token_lens[i])
+        embs = embedder.encode(
+            [documents[i] for i in idxs], batch_size=32,
+            convert_to_numpy=True, normalize_embeddings=True
+        )
+        for i, emb in zip(idxs, embs):
+            embeddings[i] = emb
+    return embeddings
+
+def _persist_batch(batch):
+    """Embed a batch of (id, document, metadata) writes and upsert them."""
+    ids, documents, metadatas = zip(*batch)
+    embeddings = _embed_bucketed(documents)
+    # Chroma has no native int8 storage yet, so keep the compact copy in
+    # metadata alongside the fp32 vector it indexes.
+    for meta, emb in zip(metadatas, embeddings):
+        meta["q8"] = base64.b64encode(quantize_embedding(emb).tobytes()).decode("ascii")
+    memory_collection.upsert(
+        documents=list(documents),
+        embeddings=[emb.tolist() for emb in embeddings],
+        ids=list(ids),
+        metadatas=list(metadatas)
+    )
+
+# Background writer: persistence never blocks the user-visible turn
+_writer_queue = queue.Queue()
+
+def _memory_writer():
+    while True:
+        batch = _writer_queue.get()
+        try:
+            _persist_batch(batch)
+        except Exception as e:
+            print(f"[!] Memory flush failed: {e}")
+        finally:
+            _writer_queue.task_done()
+
+threading.Thread(target=_memory_writer, daemon=True).start()
+
+def flush_memory():
+    """Hand the buffered writes to the background writer thread."""
+    if not _pending_memory:
+        return
+    batch = list(_pending_memory)
+    _pending_memory.clear()
+    # Only a flush changes what recall_memory can return, so this is the
+    # point where memoized retrievals for the affected users go stale
+    for _, _, metadata in batch:
+        user_id = metadata.get("user_id")
+        _memory_epoch[user_id] = _memory_epoch.get(user_id, 0) + 1
+    _writer_queue.put(batch)
+
+def _drain_writer():
+    flush_memory()
+    _writer_queue.join()
+
+atexit.register(_drain_writer)
+
 def add_memory(user_id: str, text: str, role="user"):
-    """Store conversation chunks into memory DB."""
-    embedding = embedder.encode([text])[0].tolist()
+    """Buffer conversation chunks for the memory DB; embedded and flushed in batches."""
     mem_id = f"{user_id}_{role}_{hash_text(text)[:8]}"
     metadata = {
         "user_id": user_id,
         "role": role,
         "timestamp": datetime.now().isoformat()
     }
-    memory_collection.upsert(
-        documents=[text],
-        embeddings=[embedding],
-        ids=[mem_id],
-        metadatas=[metadata]
-    )
+    _pending_memory.append((mem_id, text, metadata))
+    if len(_pending_memory) >= MEMORY_FLUSH_SIZE:
+        flush_memory()
 
-def recall_memory(user_id: str, query: str, top_k=3):
-    """Retrieve semantically related memories."""
+async def recall_memory(user_id: str, query: str, top_k=3):
+    """Retrieve semantically related memories, MMR-re-ranked on their q8 vectors."""
     try:
-        results = memory_collection.query(
-            query_texts=[query],
-            n_results=top_k,
-            where={"user_id": user_id}
+        # Embed with the shared embedder — query_texts would go through
+        # Chroma's server-side default embedding function instead
+        query_emb = embedder.encode([query], normalize_embeddings=True)[0].astype(np.float32)
+        results = await asyncio.to_thread(
+            memory_collection.query,
+            query_embeddings=[query_emb.tolist()],
+            n_results=top_k * 4,
+            where={"user_id": user_id},
+            include=["documents", "metadatas"],
         )
         docs = results.get("documents", [[]])[0]
+        metadatas = results.get("metadatas", [[]])[0] or []
+        if len(docs) > top_k and all(m and "q8" in m for m in metadatas):
+            # Re-rank on the compact stored vectors instead of pulling the
+            # fp32 embeddings back out of Chroma
+            mem_embs = np.stack([dequantize_embedding(m["q8"]) for m in metadatas])
+            order = mmr_rerank(query_emb, mem_embs, top_k)
+            docs = [docs[i] for i in order]
+        else:
+            docs = docs[:top_k]
         return "\n".join(docs)
     except Exception as e:
         print(f"[!] Memory recall failed: {e}")
@@ -88,50 +261,67 @@ def recall_memory(user_id: str, query: str, top_k=3):
 # -----------------------------
 # SMART SEARCH
 # -----------------------------
-def search_docs(query_text):
-    """Semantic search on static KB."""
+def mmr_rerank(query_emb, doc_embs, k, lam=MMR_LAMBDA):
+    """Vectorized maximal-marginal-relevance selection over normalized embeddings."""
+    sims = doc_embs @ query_emb
+    n = len(sims)
+    if n <= k:
+        return list(np.argsort(-sims))
+    selected = []
+    picked = np.zeros(n, dtype=bool)
+    max_selected_sim = np.zeros(n, dtype=doc_embs.dtype)
+    for step in range(k):
+        if step == 0:
+            scores = sims.copy()
+        else:
+            scores = lam * sims - (1 - lam) * max_selected_sim
+        scores[picked] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        picked[best] = True
+        np.maximum(max_selected_sim, doc_embs @ doc_embs[best], out=max_selected_sim)
+    return selected
+
+async def search_docs(query_text):
+    """Semantic search on static KB with MMR diversity re-ranking."""
     try:
-        results = static_collection.query(query_texts=[query_text], n_results=MAX_CONTEXT_DOCS)
+        query_emb = embedder.encode([query_text], normalize_embeddings=True)[0]
+        results = await asyncio.to_thread(
+            static_collection.query,
+            query_embeddings=[query_emb.tolist()],
+            n_results=MMR_POOL_SIZE,
+            include=["embeddings", "documents", "metadatas"],
+        )
         docs = results["documents"][0]
         metadatas = results.get("metadatas", [[]])[0]
+        if not docs:
+            return ""
+        doc_embs = np.asarray(results["embeddings"][0], dtype=np.float32)
+        order = mmr_rerank(query_emb.astype(np.float32), doc_embs, MAX_CONTEXT_DOCS)
         context_blocks = []
-        for i, doc in enumerate(docs):
-            source = metadatas[i].get("source", "unknown") if metadatas else "unknown"
-            context_blocks.append(f"[Source: {source}]\n{doc}")
+        for i in order:
+            # build_index.py adds docs without metadatas, so entries can be None
+            source = (metadatas[i] or {}).get("source", "unknown") if metadatas else "unknown"
+            context_blocks.append(f"[Source: {source}]\n{docs[i]}")
         return "\n\n".join(context_blocks)
     except Exception as e:
         return f"[ERROR] search_docs failed: {e}"
 
-# -----------------------------
-# QUERY REPHRASING
-# -----------------------------
-def rephrase_query(prompt):
-    """Optional step for clarity."""
-    if len(prompt.split()) < 3:
-        return prompt
-    refined_prompt = f"Rephrase this for clarity: {prompt}"
-    try:
-        res = requests.post(
-            OLLAMA_API,
-            json={"model": MODEL_NAME, "prompt": refined_prompt, "stream": False},
-        )
-        if res.ok:
-            return res.json()["response"].strip()
-    except:
-        pass
-    return prompt
-
 # -----------------------------
 # QUERY OLLAMA
 # -----------------------------
-def query_ollama(prompt, context=""):
-    payload = {
-        "model": MODEL_NAME,
-        "prompt": f"""You are a DevOps expert assistant.
+# Constant system prefix — Ollama caches KV state by prompt prefix, so
+# keeping the variable context out of it lets consecutive turns reuse it
+SYSTEM_PROMPT = """You are a DevOps expert assistant.
 Use the provided context (memory + docs) to give accurate, step-by-step answers.
 If context is missing, answer with your own knowledge.
+First silently rephrase the user question for clarity, then answer it."""
 
-Context:
+async def query_ollama(prompt, context=""):
+    payload = {
+        "model": MODEL_NAME,
+        "system": SYSTEM_PROMPT,
+        "prompt": f"""Context:
 {context}
 
 User question:
@@ -139,43 +329,187 @@ User question:
 
 Answer clearly:""",
         "stream": True,
+        "keep_alive": "30m",
         "options": {"temperature": 0.6, "num_predict": 512, "top_k": 30},
     }
 
     try:
-        with requests.post(OLLAMA_API, json=payload, stream=True) as response:
+        async with ollama_client.stream("POST", OLLAMA_API, json=payload) as response:
             if response.status_code != 200:
                 return f"[ERROR] Ollama returned {response.status_code}"
 
-            answer = ""
-            for line in response.iter_lines(decode_unicode=True):
+            buf = bytearray()
+            async for line in response.aiter_lines():
                 if not line:
                     continue
                 try:
-                    data = json.loads(line)
-                    token = data.get("response", "")
-                    print(token, end="", flush=True)
-                    answer += token
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
+                token = data.get("response", "")
+                if token:
+                    encoded = token.encode("utf-8")
+                    buf.extend(encoded)
+                    sys.stdout.buffer.write(encoded)
+                    sys.stdout.flush()
             print()
-            return answer.strip()
+            return buf.decode("utf-8").strip()
     except Exception as e:
         return f"[ERROR] Ollama request failed: {str(e)}"
 
+# -----------------------------
+# REPEAT-QUERY SHORT CIRCUIT
+# -----------------------------
+_recent_prompts = deque(maxlen=RECENT_PROMPTS)  # (embedding, raw_prompt) pairs
+
+def canonicalize_query(query, embedding):
+    """Map a near-repeat of a recent prompt back to that earlier prompt.
+
+    Repeats and close paraphrases then hit the same prompt-cache entry
+    instead of fanning out into near-duplicate cache ids.
+    """
+    if _recent_prompts:
+        recent_embs = np.stack([emb for emb, _ in _recent_prompts])
+        sims = recent_embs @ embedding
+        best = int(np.argmax(sims))
+        if sims[best] > RECENT_SIM_THRESHOLD:
+            return _recent_prompts[best][1]
+    _recent_prompts.append((embedding, query))
+    return query
+
+# -----------------------------
+# SEMANTIC PROMPT CACHE
+# -----------------------------
+# The cache is small enough to mirror in RAM, so lookups are one dot
+# product over a dense matrix instead of a Chroma round trip.
+_cache_embs = np.empty((0, 0), dtype=np.float32)
+_cache_responses = []
+
+if HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def cos_sims(query_emb, emb_matrix):
+        n = emb_matrix.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            s = np.float32(0.0)
+            for j in range(emb_matrix.shape[1]):
+                s += emb_matrix[i, j] * query_emb[j]
+            out[i] = s
+        return out
+else:
+    def cos_sims(query_emb, emb_matrix):
+        return emb_matrix @ query_emb
+
+def warm_prompt_cache():
+    """Rebuild the in-RAM mirror of the prompt cache from Chroma."""
+    global _cache_embs, _cache_responses
+    try:
+        entries = prompt_cache.get(include=["embeddings", "metadatas"])
+        embs = entries.get("embeddings")
+        metadatas = entries.get("metadatas") or []
+        if embs is not None and len(embs):
+            _cache_embs = np.asarray(embs, dtype=np.float32)
+            _cache_responses = [m.get("response", "") for m in metadatas]
+        else:
+            _cache_embs = np.empty((0, 0), dtype=np.float32)
+            _cache_responses = []
+    except Exception as e:
+        print(f"[!] Prompt cache warm-up failed: {e}")
+
+warm_prompt_cache()
+
+def evict_cache():
+    """Drop the oldest cached prompts once the cache grows past its limit."""
+    try:
+        count = prompt_cache.count()
+        if count <= CACHE_MAX_ENTRIES:
+            return
+        entries = prompt_cache.get(include=["metadatas"])
+        by_age = sorted(
+            zip(entries["ids"], entries["metadatas"]),
+            key=lambda pair: pair[1].get("ts", ""),
+        )
+        stale_ids = [entry_id for entry_id, _ in by_age[: count - CACHE_MAX_ENTRIES]]
+        if stale_ids:
+            prompt_cache.delete(ids=stale_ids)
+            warm_prompt_cache()
+    except Exception as e:
+        print(f"[!] Cache eviction failed: {e}")
+
+async def cached_query(prompt, context="", embedding=None):
+    """Answer from the prompt cache when a semantically close prompt was seen before."""
+    global _cache_embs
+    if embedding is None:
+        embedding = embedder.encode([prompt], normalize_embeddings=True)[0]
+    query_emb = np.asarray(embedding, dtype=np.float32)
+
+    if _cache_responses:
+        sims = cos_sims(query_emb, _cache_embs)
+        best = int(np.argmax(sims))
+        # Embeddings are normalized, so the dot product is cosine similarity
+        if sims[best] >= CACHE_SIM_THRESHOLD:
+            print("[+] Cache hit — returning stored answer.")
+            cached = _cache_responses[best]
+            print(cached)
+            return cached
+
+    answer = await query_ollama(prompt, context)
+
+    try:
+        if not answer.startswith("[ERROR]"):
+            prompt_cache.upsert(
+                ids=[hash_text(prompt)],
+                embeddings=[query_emb.tolist()],
+                documents=[prompt],
+                metadatas=[{"response": answer, "ts": datetime.now().isoformat()}],
+            )
+            if _cache_embs.size:
+                _cache_embs = np.vstack([_cache_embs, query_emb[None, :]])
+            else:
+                _cache_embs = query_emb[None, :].copy()
+            _cache_responses.append(answer)
+            evict_cache()
+    except Exception as e:
+        print(f"[!] Cache store failed: {e}")
+    return answer
+
 # -----------------------------
 # CONTEXT BUILDER
 # -----------------------------
-def build_context(user_id, user_query):
-    """Merge short-term history, semantic memory, and doc search."""
-    # Short-term memory
+_context_cache = {}  # (user_id, epoch, embedding-hash) -> (long_term, docs)
+_memory_epoch = {}   # per-user counter; bumped when a batch is flushed to Chroma
+
+def _context_key(user_id, query_emb):
+    """Locality-sensitive cache key: rounded leading embedding dims + epoch."""
+    rounded = np.round(np.asarray(query_emb[:16], dtype=np.float32), 2)
+    emb_hash = hashlib.blake2b(rounded.tobytes(), digest_size=8).hexdigest()
+    return (user_id, _memory_epoch.get(user_id, 0), emb_hash)
+
+async def build_context(user_id, user_query, query_emb=None):
+    """Merge short-term history, semantic memory, and doc search.
+
+    Only the retrieval half is memoized — short-term history changes every
+    turn and must never be served from cache.
+    """
+    key = _context_key(user_id, query_emb) if query_emb is not None else None
+    cached = _context_cache.get(key) if key is not None else None
+    if cached is not None:
+        long_term, docs = cached
+    else:
+        # Long-term memory and static docs run concurrently
+        long_term, docs = await asyncio.gather(
+            recall_memory(user_id, user_query, top_k=3),
+            search_docs(user_query),
+        )
+        if key is not None:
+            _context_cache[key] = (long_term, docs)
+            while len(_context_cache) > CONTEXT_CACHE_SIZE:
+                _context_cache.pop(next(iter(_context_cache)))
+
+    # Short-term memory (always rebuilt from the live deques)
     short_term = "\n".join(
-        [f"User: {q}\nAgent: {a}" for q, a in conversation_history[-MEMORY_SIZE:]]
+        f"User: {q}\nAgent: {a}" for q, a in zip(recent_queries, recent_answers)
     )
-    # Long-term memory (semantic)
-    long_term = recall_memory(user_id, user_query, top_k=3)
-    # Static docs
-    docs = search_docs(user_query)
     return f"Short-term:\n{short_term}\n\nLong-term memory:\n{long_term}\n\nDocs:\n{docs}"
 
 # -----------------------------
@@ -183,28 +517,38 @@ def build_context(user_id, user_query):
 # -----------------------------
 USER_ID = "onkar"
 
-while True:
-    query = input("🧩 You: ").strip()
-    if query.lower() in ["exit", "quit"]:
-        print("👋 Exiting agent.")
-        break
-    if not query:
-        continue
+async def main():
+    while True:
+        query = input("🧩 You: ").strip()
+        if query.lower() in ["exit", "quit"]:
+            print("👋 Exiting agent.")
+            break
+        if not query:
+            continue
+
+        print("[+] Thinking...\n")
+
+        # Embed once per turn; reused for the repeat check and the cache lookup
+        query_emb = embedder.encode([query], normalize_embeddings=True)[0]
+        query = canonicalize_query(query, query_emb)
+
+        context = await build_context(USER_ID, query, query_emb)
 
-    print("[+] Thinking...\n")
+        print("🤖 Agent:", end=" ", flush=True)
+        answer = await cached_query(query, context, embedding=query_emb)
 
-    refined_query = rephrase_query(query)
-    context = build_context(USER_ID, refined_query)
+        # Track conversation
+        recent_queries.append(query)
+        recent_answers.append(answer)
 
-    print("🤖 Agent:", end=" ", flush=True)
-    answer = query_ollama(refined_query, context)
+        # Save to persistent memory
+        add_memory(USER_ID, query, role="user")
+        add_memory(USER_ID, answer, role="agent")
 
-    # Track conversation
-    conversation_history.append((query, answer))
+        print("\n" + "-" * 80)
 
-    # Save to persistent memory
-    add_memory(USER_ID, query, role="user")
-    add_memory(USER_ID, answer, role="agent")
+    await ollama_client.aclose()
 
-    print("\n" + "-" * 80)
+if __name__ == "__main__":
+    asyncio.run(main())
 
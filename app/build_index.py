@@ -3,7 +3,10 @@
 # ===============================================
 
 import os
+import mmap
 import chromadb
+import torch
+from concurrent.futures import ThreadPoolExecutor
 from chromadb import PersistentClient
 from sentence_transformers import SentenceTransformer
 
@@ -14,6 +17,8 @@ DB_DIR = "./chroma_db1"
 COLLECTION_NAME = "devops_mini"          # For all-MiniLM-L6-v2 (384-dim)
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"     # Compact + fast
 DATA_DIR = "./data"                      # Folder containing your text or markdown docs
+ENCODE_BATCH_SIZE = 128                  # Large batches keep the GPU saturated
+INSERT_BATCH_SIZE = 250                  # Chroma's sweet spot for batched adds
 
 # -----------------------------
 # INIT
@@ -21,36 +26,65 @@ DATA_DIR = "./data"                      # Folder containing your text or markdo
 print("[+] Connecting to Chroma...")
 client = PersistentClient(path=DB_DIR)
 
-# Load embedding model
-print(f"[+] Loading embedding model: {EMBEDDING_MODEL}")
-model = SentenceTransformer(EMBEDDING_MODEL)
+# Load embedding model (GPU when available)
+device = "cuda" if torch.cuda.is_available() else "cpu"
+print(f"[+] Loading embedding model: {EMBEDDING_MODEL} (device={device})")
+model = SentenceTransformer(EMBEDDING_MODEL, device=device)
 
-# Create or load collection
+# Create or load collection (cosine HNSW — embeddings are pre-normalized)
+collection = None
 try:
     collection = client.get_collection(COLLECTION_NAME)
-    print(f"[+] Existing collection '{COLLECTION_NAME}' loaded.")
+    if (collection.metadata or {}).get("hnsw:space") != "cosine":
+        # Built under default L2 with unnormalized vectors — rebuild in cosine space
+        print(f"[!] Collection '{COLLECTION_NAME}' predates cosine space — recreating...")
+        client.delete_collection(COLLECTION_NAME)
+        collection = None
+    else:
+        print(f"[+] Existing collection '{COLLECTION_NAME}' loaded.")
 except Exception:
     print(f"[!] Collection '{COLLECTION_NAME}' not found — creating new one...")
-    collection = client.create_collection(COLLECTION_NAME)
+if collection is None:
+    collection = client.create_collection(
+        COLLECTION_NAME, metadata={"hnsw:space": "cosine"}
+    )
     print(f"[+] Created new collection '{COLLECTION_NAME}'.")
 
 # -----------------------------
 # BUILD INDEX
 # -----------------------------
+def iter_docs(root):
+    """Yield .txt/.md paths under root via scandir, avoiding extra stat calls."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith((".txt", ".md")):
+                    yield entry.path
+
+def read_doc(path):
+    """Read a document through mmap to skip the extra userspace copy."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return m[:].decode("utf-8", "ignore").strip()
+
 print(f"[+] Scanning '{DATA_DIR}' for documents...")
 docs = []
 doc_ids = []
 
-for root, _, files in os.walk(DATA_DIR):
-    for f in files:
-        if f.endswith((".txt", ".md")):
-            path = os.path.join(root, f)
-            with open(path, "r", encoding="utf-8") as file:
-                text = file.read().strip()
-                if text:
-                    docs.append(text)
-                    doc_ids.append(path)
-                    print(f"    └── Added: {path}")
+paths = sorted(iter_docs(DATA_DIR))
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+    texts = pool.map(read_doc, paths)
+    for path, text in zip(paths, texts):
+        if text:
+            docs.append(text)
+            doc_ids.append(path)
+            print(f"    └── Added: {path}")
 
 if not docs:
     print("[!] No text files found in data folder.")
@@ -58,14 +92,40 @@ if not docs:
 
 print(f"[+] Found {len(docs)} files. Building embeddings...")
 
-embeddings = model.encode(docs, show_progress_bar=True)
+# Sort by length so each batch pads to similar sizes, then restore the
+# original order afterwards so ids and embeddings stay aligned.
+order = sorted(range(len(docs)), key=lambda i: len(docs[i]))
+sorted_docs = [docs[i] for i in order]
+
+if device == "cuda":
+    with torch.autocast(device_type="cuda", dtype=torch.float16):
+        sorted_embeddings = model.encode(
+            sorted_docs,
+            batch_size=ENCODE_BATCH_SIZE,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+else:
+    sorted_embeddings = model.encode(
+        sorted_docs,
+        batch_size=ENCODE_BATCH_SIZE,
+        show_progress_bar=True,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+
+embeddings = sorted_embeddings.copy()
+embeddings[order] = sorted_embeddings
 
-# Add docs to Chroma
-collection.add(
-    documents=docs,
-    embeddings=embeddings.tolist(),
-    ids=doc_ids
-)
+# Add docs to Chroma in batches — single huge inserts degrade badly
+for start in range(0, len(docs), INSERT_BATCH_SIZE):
+    end = start + INSERT_BATCH_SIZE
+    collection.add(
+        documents=docs[start:end],
+        embeddings=embeddings[start:end].tolist(),
+        ids=doc_ids[start:end]
+    )
 
 print(f"[✓] Successfully built index for '{COLLECTION_NAME}' using {EMBEDDING_MODEL}")
 print("[✓] Database directory:", DB_DIR)
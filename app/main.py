@@ -1,20 +1,91 @@
 # app/main.py
+import asyncio
+import re
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from app.agent import analyze_error
+from app.agent import ollama_client, OLLAMA_API, MODEL_NAME
+
+# Dynamic batching: concurrent requests share one Ollama call
+BATCH_MAX_SIZE = 8     # max requests fused into a single prompt
+BATCH_MAX_WAIT = 0.02  # seconds to wait for more requests to arrive
 
 app = FastAPI(title="DevOps Troubleshooter")
 
 class ErrorRequest(BaseModel):
     error: str
 
+_batch_queue: asyncio.Queue = asyncio.Queue()
+
+async def analyze_batch(errors):
+    """Analyze several error logs in one Ollama call and split the answers."""
+    numbered = "\n".join(f"{i + 1}. {err}" for i, err in enumerate(errors))
+    prompt = f"""You are a DevOps expert assistant.
+For each numbered error log below, explain the likely cause and how to fix it.
+Start every answer with 'Answer <number>:' on its own line.
+
+Error logs:
+{numbered}
+"""
+    res = await ollama_client.post(
+        OLLAMA_API,
+        json={"model": MODEL_NAME, "prompt": prompt, "stream": False},
+    )
+    if res.status_code != 200:
+        raise RuntimeError(f"Ollama returned {res.status_code}")
+    text = res.json()["response"]
+
+    answers = [""] * len(errors)
+    parts = re.split(r"Answer\s+(\d+)\s*:", text)
+    for num, body in zip(parts[1::2], parts[2::2]):
+        idx = int(num) - 1
+        if 0 <= idx < len(errors):
+            answers[idx] = body.strip()
+    # If the model ignored the numbering, fall back to the raw response
+    if not any(answers):
+        answers = [text.strip()] * len(errors)
+    return answers
+
+async def batcher():
+    """Drain the queue in batches of up to BATCH_MAX_SIZE or BATCH_MAX_WAIT."""
+    loop = asyncio.get_event_loop()
+    while True:
+        batch = [await _batch_queue.get()]
+        deadline = loop.time() + BATCH_MAX_WAIT
+        while len(batch) < BATCH_MAX_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_batch_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        errors = [error for error, _ in batch]
+        try:
+            answers = await analyze_batch(errors)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+@app.on_event("startup")
+async def start_batcher():
+    # Keep a strong reference — asyncio only holds tasks weakly and a
+    # collected batcher would leave every request hanging on its future
+    app.state.batcher_task = asyncio.create_task(batcher())
+
 @app.post("/analyze-log")
 async def analyze_log(req: ErrorRequest):
     if not req.error or len(req.error) < 3:
         raise HTTPException(status_code=400, detail="Provide an error string in 'error' field")
+    future = asyncio.get_event_loop().create_future()
+    await _batch_queue.put((req.error, future))
     try:
-        result = analyze_error(req.error)
-        return result
+        result = await future
+        return {"analysis": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-